@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""Regenerate every benchmark graph in one process so matplotlib is only
+imported once."""
+import os
+
+import plot_nrdp
+import plot_readme
+import plot_results
+
+def main():
+    plot_nrdp.main()
+    plot_readme.main()
+    # The v2 results predate the checked-in CSVs and only exist locally.
+    if os.path.exists(plot_results.V2_PATH):
+        plot_results.main()
+    else:
+        print(f"\nSkipping plot_results.py: {plot_results.V2_PATH} not found")
+
+if __name__ == "__main__":
+    main()
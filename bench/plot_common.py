@@ -0,0 +1,90 @@
+"""Helpers shared by the benchmark plot scripts."""
+import csv
+
+import numpy as np
+
+# Plots are mostly flat color; zlib level 1 is several times faster to
+# encode than the default at a small size cost.
+PNG_OPTS = {'compress_level': 1}
+
+def read_csv(path):
+    """Read a numeric CSV into a structured float array keyed by header."""
+    with open(path, newline='') as f:
+        header = next(csv.reader(f))
+        # Columns map to fields by position, so loadtxt fills each field
+        # by index with no per-row dict or name lookup.
+        return np.loadtxt(f, delimiter=',', dtype=[(key, float) for key in header], ndmin=1)
+
+def log_x(xs):
+    """log10 of xs, with non-positive values masked to NaN as a log scale would."""
+    xs = np.asarray(xs, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(xs > 0, np.log10(xs), np.nan)
+
+def log_ticks(*logxs):
+    """Tick positions and labels for x data that is already log10.
+
+    Graphs plot log10(x) on a linear axis rather than using a log scale, so
+    the transform runs once per dataset instead of on every draw. The ticks
+    mirror a log scale: labelled decades plus unlabelled 2-9 multiples. When
+    the data stays inside one decade the multiples are labelled instead, and
+    failing that the data points themselves.
+    """
+    lo = min(np.nanmin(x) for x in logxs)
+    hi = max(np.nanmax(x) for x in logxs)
+    decades = 10 ** np.arange(np.floor(lo), np.ceil(hi) + 1)
+    steps = np.log10(np.outer(decades, np.arange(1, 10)).ravel())
+    steps = steps[(steps >= lo - 1e-9) & (steps <= hi + 1e-9)]
+    is_decade = np.isclose(steps, np.round(steps))
+    if is_decade.any():
+        major, minor = steps[is_decade], steps[~is_decade]
+    elif steps.size:
+        major, minor = steps, steps[:0]
+    else:
+        points = np.concatenate(logxs)
+        major, minor = np.unique(points[~np.isnan(points)]), steps
+    return major, [f'{10 ** v:,.0f}' for v in major], minor
+
+def set_log_x(ax, ticks):
+    major, labels, minor = ticks
+    ax.set_xticks(major, labels)
+    ax.set_xticks(minor, minor=True)
+
+def style_ax(ax):
+    """Style axes with semi-transparent white fill so text is readable on both
+    GitHub light and dark themes."""
+    ax.set_facecolor((1, 1, 1, 0.85))
+    for spine in ax.spines.values():
+        spine.set_color('#586069')
+        spine.set_linewidth(0.8)
+    ax.tick_params(colors='#24292e', labelsize=10)
+    ax.xaxis.label.set_color('#24292e')
+    ax.yaxis.label.set_color('#24292e')
+    ax.title.set_color('#24292e')
+    ax.grid(True, alpha=0.25, color='#586069', linewidth=0.5)
+
+def save(fig, path):
+    fig.patch.set_facecolor((1, 1, 1, 0.85))
+    fig.tight_layout()
+    # A 1 MiB buffer holds a whole PNG, so it reaches disk in one write.
+    with open(path, 'wb', buffering=1 << 20) as fp:
+        fig.canvas.print_png(fp, pil_kwargs=PNG_OPTS)
+    print(f"  Saved {path}")
+
+def draw_plot(ax, ticks, series, title, xlabel, ylabel, hline=None, markersize=7):
+    """Redraw ax with each series plotted against log10 x.
+
+    series holds (xs, ys, fmt, label, color) tuples. hline, if given, is a
+    dict of axhline arguments for a reference line drawn after the series.
+    """
+    ax.clear()
+    style_ax(ax)
+    for xs, ys, fmt, label, color in series:
+        ax.plot(xs, ys, fmt, label=label, color=color, linewidth=2, markersize=markersize)
+    if hline:
+        ax.axhline(**hline)
+    set_log_x(ax, ticks)
+    ax.set_title(title, fontsize=13, fontweight='bold')
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.legend(loc='best', framealpha=0.95, fontsize=9)